@@ -14,6 +14,9 @@ LLM_MODEL = "google/flan-t5-base"
 EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 CLASSIFICATION_MODEL = "logistic_regression"
 
+PROMPT_TEMPLATE_NAME = "suggestion"
+PROMPT_TEMPLATE_VERSION = None  # None = latest version in PROMPTS_DIR
+
 QUALITY_WEIGHTS = {
     "greeting": 0.15,
     "problem_identification": 0.25,
@@ -23,4 +26,7 @@ QUALITY_WEIGHTS = {
 }
 
 MAX_RESPONSE_TIME_MS = 2000  # 2 seconds max for suggestions
+SUGGESTION_DEBOUNCE_MS = 400  # wait for message bursts to settle before generating
+SUGGESTION_WORKERS = 2  # background generation threads shared by all chat sessions
+SUGGESTION_POLL_MS = 500  # how often the chat UI checks for finished suggestions
 CONVERSATION_HISTORY_LENGTH = 10
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""
+Versioned prompt templates loaded from PROMPTS_DIR.
+Fixed template segments are tokenized once and cached, so building model
+inputs only requires tokenizing the conversation itself.
+"""
+
+import glob
+import json
+import logging
+import os
+import re
+import weakref
+
+from config import PROMPTS_DIR
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_FILE_PATTERN = re.compile(r"^(?P<name>.+)_v(?P<version>\d+)\.json$")
+
+class PromptTemplate:
+    """
+    A single prompt template version with its pre-tokenized segments.
+
+    Prompt layout:
+        header + conversation + instruction_prefix + category instruction + footer
+    """
+    def __init__(self, path, data):
+        self.path = path
+        self.name = data["name"]
+        self.version = int(data["version"])
+        self.header = data["header"]
+        self.instruction_prefix = data.get("instruction_prefix", "")
+        self.footer = data.get("footer", "")
+        self.categories = data["categories"]
+        self._token_cache = weakref.WeakKeyDictionary()  # tokenizer -> cached segment IDs
+
+    def render(self, conversation_context, category):
+        return (
+            self.header
+            + conversation_context
+            + self.instruction_prefix
+            + self.categories.get(category, "")
+            + self.footer
+        )
+
+    def segments(self, tokenizer):
+        """
+        Token IDs for the fixed header and per-category tail, tokenized once per tokenizer.
+        """
+        if tokenizer not in self._token_cache:
+            def encode(text):
+                return tokenizer.encode(text, add_special_tokens=False)
+            self._token_cache[tokenizer] = {
+                "header": encode(self.header),
+                "tails": {
+                    category: encode(self.instruction_prefix + instruction + self.footer)
+                    for category, instruction in self.categories.items()
+                },
+                "empty_tail": encode(self.instruction_prefix + self.footer)
+            }
+        return self._token_cache[tokenizer]
+
+    def check_fits(self, tokenizer, max_length):
+        """
+        Raise ValueError if the fixed segments leave no room for the conversation.
+        """
+        cached = self.segments(tokenizer)
+        eos = 1 if tokenizer.eos_token_id is not None else 0
+        for category, tail in cached["tails"].items():
+            fixed = len(cached["header"]) + len(tail) + eos
+            if fixed >= max_length:
+                raise ValueError(
+                    f"Prompt template {self.path} ({category}) uses {fixed} fixed tokens, "
+                    f"leaving no room for the conversation within max_length={max_length}"
+                )
+
+    def build_input_ids(self, tokenizer, conversation_context, category, max_length=512):
+        """
+        Assemble input IDs from cached template segments and the tokenized conversation.
+        The conversation is truncated from the left so the instruction is never cut off.
+        """
+        cached = self.segments(tokenizer)
+        header = cached["header"]
+        tail = cached["tails"].get(category, cached["empty_tail"])
+        eos = [tokenizer.eos_token_id] if tokenizer.eos_token_id is not None else []
+        budget = max_length - len(header) - len(tail) - len(eos)
+        if budget <= 0:
+            raise ValueError(
+                f"Prompt template {self.path} ({category}) uses {max_length - budget} fixed tokens, "
+                f"leaving no room for the conversation within max_length={max_length}"
+            )
+        conversation = tokenizer.encode(conversation_context, add_special_tokens=False)
+        return header + conversation[-budget:] + tail + eos
+
+class PromptTemplateStore:
+    """
+    Loads prompt templates from a directory and hot-reloads them on file change.
+
+    Template files are named `<name>_v<version>.json`; the filename sets the
+    template's name and version. Requesting a template without a version
+    returns the latest one. A template file that fails to parse, disagrees
+    with its filename, or (when a tokenizer is given) does not fit in
+    `max_length` tokens keeps serving its last good version.
+    """
+    def __init__(self, prompts_dir=PROMPTS_DIR, tokenizer=None, max_length=512):
+        self.prompts_dir = prompts_dir
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        self._templates = {}  # path -> (mtime_ns, PromptTemplate)
+        self._failed = {}  # path -> mtime_ns of the last version that failed to load
+        self._dir_mtime = None
+        self._paths = []
+
+    def _refresh(self):
+        try:
+            dir_mtime = os.stat(self.prompts_dir).st_mtime_ns
+        except FileNotFoundError:
+            dir_mtime = None
+        if dir_mtime != self._dir_mtime:
+            self._dir_mtime = dir_mtime
+            self._paths = sorted(
+                path for path in glob.glob(os.path.join(self.prompts_dir, "*_v*.json"))
+                if TEMPLATE_FILE_PATTERN.match(os.path.basename(path))
+            )
+            self._templates = {p: t for p, t in self._templates.items() if p in self._paths}
+        for path in self._paths:
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                self._templates.pop(path, None)
+                continue
+            cached = self._templates.get(path)
+            if (cached is None or cached[0] != mtime) and self._failed.get(path) != mtime:
+                self._load(path, mtime)
+
+    def _load(self, path, mtime):
+        match = TEMPLATE_FILE_PATTERN.match(os.path.basename(path))
+        name, version = match.group("name"), int(match.group("version"))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("name", name) != name or int(data.get("version", version)) != version:
+                raise ValueError(
+                    f"body declares {data.get('name')!r} v{data.get('version')}, "
+                    f"filename declares {name!r} v{version}"
+                )
+            template = PromptTemplate(path, dict(data, name=name, version=version))
+            if self.tokenizer is not None:
+                template.check_fits(self.tokenizer, self.max_length)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self._failed[path] = mtime
+            logger.warning("Could not load prompt template %s, keeping last good version: %s", path, e)
+            return
+        self._failed.pop(path, None)
+        self._templates[path] = (mtime, template)
+
+    def get(self, name, version=None):
+        self._refresh()
+        candidates = [
+            template for _, template in self._templates.values()
+            if template.name == name and (version is None or template.version == int(version))
+        ]
+        if not candidates:
+            raise KeyError(f"No prompt template '{name}' (version={version}) in {self.prompts_dir}")
+        return max(candidates, key=lambda template: template.version)
+
+    def versions(self, name):
+        self._refresh()
+        return sorted(t.version for _, t in self._templates.values() if t.name == name)
\ No newline at end of file
@@ -3,10 +3,13 @@ Suggestion engine for real-time AI coaching in customer support chats.
 Tracks conversation state and generates coaching suggestions using an LLM.
 """
 
-from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, StoppingCriteria, StoppingCriteriaList
 import torch
 import time
 
+from config import PROMPT_TEMPLATE_NAME, PROMPT_TEMPLATE_VERSION
+from engine.prompt_templates import PromptTemplateStore
+
 class ConversationState:
     """
     Tracks conversation messages and context.
@@ -14,13 +17,20 @@ class ConversationState:
     def __init__(self, conversation_id):
         self.conversation_id = conversation_id
         self.messages = []  # list of dicts: {"sender": "agent"/"customer", "text": str, "timestamp": float}
+        self.listeners = []  # callables invoked with each new message
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
 
     def add_message(self, sender, text):
-        self.messages.append({
+        message = {
             "sender": sender,
             "text": text,
             "timestamp": time.time()
-        })
+        }
+        self.messages.append(message)
+        for listener in self.listeners:
+            listener(message)
 
     def get_context(self, max_tokens=512):
         """
@@ -36,20 +46,37 @@ class ConversationState:
             tokens = tokens[-max_tokens:]
         return " ".join(tokens)
 
+class CancellationCriteria(StoppingCriteria):
+    """
+    Stops generation early once `should_stop()` returns True.
+    """
+    def __init__(self, should_stop):
+        self.should_stop = should_stop
+
+    def __call__(self, input_ids, scores, **kwargs):
+        # A plain bool works with both the any()-based (<4.39) and tensor-based criteria lists
+        return bool(self.should_stop())
+
 class SuggestionEngine:
     """
     Generates coaching suggestions using a pretrained LLM.
     """
-    def __init__(self, model_name="google/flan-t5-base", device=None):
+    def __init__(self, model_name="google/flan-t5-base", device=None,
+                 prompt_name=PROMPT_TEMPLATE_NAME, prompt_version=PROMPT_TEMPLATE_VERSION,
+                 prompt_store=None):
         self.model_name = model_name
+        self.prompt_name = prompt_name
+        self.prompt_version = prompt_version
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
         self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        self.prompt_store = prompt_store or PromptTemplateStore(tokenizer=self.tokenizer, max_length=512)
         self.model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name).to(self.device)
         self.model.eval()
 
-    def generate_suggestion(self, conversation_context, category):
+    def generate_suggestion(self, conversation_context, category, should_stop=None):
         """
         Generate a coaching suggestion for a given category based on conversation context.
+        If `should_stop` is given, generation is cancelled as soon as it returns True.
 
         Categories:
             - tone_adjustment
@@ -57,11 +84,15 @@ class SuggestionEngine:
             - technical_accuracy
             - policy_reminder
         """
-        prompt = self._build_prompt(conversation_context, category)
-        inputs = self.tokenizer(prompt, return_tensors="pt", truncation=True, max_length=512).to(self.device)
+        template = self._get_template()
+        input_ids = template.build_input_ids(self.tokenizer, conversation_context, category, max_length=512)
+        input_ids = torch.tensor([input_ids], device=self.device)
+        stopping_criteria = StoppingCriteriaList([CancellationCriteria(should_stop)]) if should_stop else None
         with torch.no_grad():
             outputs = self.model.generate(
-                **inputs,
+                input_ids=input_ids,
+                attention_mask=torch.ones_like(input_ids),
+                stopping_criteria=stopping_criteria,
                 max_length=100,
                 num_beams=4,
                 early_stopping=True,
@@ -70,21 +101,8 @@ class SuggestionEngine:
         suggestion = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
         return suggestion.strip()
 
-    def _build_prompt(self, conversation_context, category):
+    def _get_template(self):
         """
-        Build a prompt for the LLM based on the conversation and suggestion category.
+        Current prompt template; the store reloads it if the file changed on disk.
         """
-        category_prompts = {
-            "tone_adjustment": "Suggest how the agent can improve the tone of their messages to be more positive and professional.",
-            "empathy": "Suggest ways the agent can show more empathy and understanding towards the customer.",
-            "technical_accuracy": "Suggest corrections or improvements to the technical accuracy of the agent's responses.",
-            "policy_reminder": "Remind the agent about relevant company policies or compliance requirements."
-        }
-        base_prompt = (
-            "You are an AI assistant helping a customer support agent improve their chat responses.\n"
-            "Here is the recent conversation:\n"
-            f"{conversation_context}\n\n"
-            f"Based on the above, {category_prompts.get(category, '')}\n"
-            "Provide a concise suggestion."
-        )
-        return base_prompt
\ No newline at end of file
+        return self.prompt_store.get(self.prompt_name, self.prompt_version)
\ No newline at end of file
@@ -0,0 +1,173 @@
+"""
+Event-driven scheduling of coaching suggestions.
+Debounces bursts of messages, cancels generations made stale by newer
+messages, and only regenerates categories whose trigger conditions changed.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+
+import nltk
+from nltk.sentiment import SentimentIntensityAnalyzer
+
+from config import CONVERSATION_HISTORY_LENGTH, SUGGESTION_DEBOUNCE_MS, SUGGESTION_WORKERS
+
+nltk.download('vader_lexicon', quiet=True)
+
+logger = logging.getLogger(__name__)
+
+# Shared by every scheduler in the process so worker threads do not accumulate
+# as chat sessions come and go (Streamlit has no session-end hook to clean up)
+_executor = ThreadPoolExecutor(max_workers=SUGGESTION_WORKERS, thread_name_prefix="suggestions")
+
+CATEGORIES = ["tone_adjustment", "empathy", "technical_accuracy", "policy_reminder"]
+
+NEGATIVE_SENTIMENT_THRESHOLD = -0.05  # standard VADER cutoff for negative text
+MIN_TONE_WORDS = 3
+
+POLICY_KEYWORDS = {
+    'refund', 'cancel', 'return', 'warranty', 'policy', 'charge', 'billing',
+    'payment', 'password', 'account', 'personal data', 'privacy', 'compensation'
+}
+TECHNICAL_KEYWORDS = {
+    'reset', 'restart', 'reboot', 'install', 'update', 'settings', 'router',
+    'error', 'configure', 'firmware', 'browser', 'cache', 'connection', 'login'
+}
+
+def _last_index(messages, predicate):
+    # Only recent messages can trigger a suggestion
+    start = max(len(messages) - CONVERSATION_HISTORY_LENGTH, 0)
+    for i in range(len(messages) - 1, start - 1, -1):
+        if predicate(messages[i]):
+            return i
+    return None
+
+def _contains_any(text, keywords):
+    text_lower = text.lower()
+    return any(keyword in text_lower for keyword in keywords)
+
+def tone_trigger(messages, sia):
+    return _last_index(
+        messages,
+        lambda m: m["sender"] == "agent" and len(m["text"].split()) >= MIN_TONE_WORDS
+    )
+
+def empathy_trigger(messages, sia):
+    return _last_index(
+        messages,
+        lambda m: m["sender"] == "customer"
+        and sia.polarity_scores(m["text"])["compound"] <= NEGATIVE_SENTIMENT_THRESHOLD
+    )
+
+def technical_trigger(messages, sia):
+    return _last_index(
+        messages,
+        lambda m: m["sender"] == "agent" and _contains_any(m["text"], TECHNICAL_KEYWORDS)
+    )
+
+def policy_trigger(messages, sia):
+    return _last_index(messages, lambda m: _contains_any(m["text"], POLICY_KEYWORDS))
+
+# Each trigger returns the index of the latest message that warrants a suggestion
+# for its category (or None). A category is regenerated only when this changes.
+DEFAULT_TRIGGERS = {
+    "tone_adjustment": tone_trigger,
+    "empathy": empathy_trigger,
+    "technical_accuracy": technical_trigger,
+    "policy_reminder": policy_trigger
+}
+
+class SuggestionScheduler:
+    """
+    Generates suggestions in the background whenever the attached conversation changes.
+    Runs on a process-wide worker pool unless an `executor` is given.
+    """
+    def __init__(self, engine, conversation_state, categories=CATEGORIES, triggers=None,
+                 debounce_ms=SUGGESTION_DEBOUNCE_MS, sentiment_analyzer=None, executor=None):
+        self.engine = engine
+        self.conversation_state = conversation_state
+        self.categories = categories
+        self.triggers = triggers or DEFAULT_TRIGGERS
+        self.debounce_seconds = debounce_ms / 1000
+        self.sia = sentiment_analyzer or SentimentIntensityAnalyzer()
+        self._lock = threading.Lock()
+        self._executor = executor or _executor
+        self._timer = None
+        self._generation = 0
+        self._completed_generation = 0
+        self._trigger_state = {}  # category -> trigger value the current suggestion was built for
+        self._suggestions = {}
+        self.last_error = None  # exception from the most recent failed run, if any
+        conversation_state.subscribe(self.notify)
+
+    def notify(self, message=None):
+        """
+        Called on every new message. Restarts the debounce timer and marks
+        any in-flight generation as stale.
+        """
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce_seconds, self._submit, args=(generation,))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def is_stale(self, generation):
+        return generation != self._generation
+
+    def is_pending(self):
+        return self._completed_generation != self._generation
+
+    def get_suggestions(self):
+        with self._lock:
+            return [(cat, self._suggestions[cat]) for cat in self.categories if cat in self._suggestions]
+
+    def shutdown(self):
+        """
+        Cancel the pending timer and any in-flight generation. The executor is
+        left running since it may be shared with other schedulers.
+        """
+        with self._lock:
+            self._generation += 1
+            if self._timer is not None:
+                self._timer.cancel()
+
+    def _submit(self, generation):
+        if not self.is_stale(generation):
+            self._executor.submit(self._run, generation)
+
+    def _run(self, generation):
+        try:
+            self._generate(generation)
+        except Exception as e:
+            # Keep the previous suggestions and stop reporting this run as pending
+            logger.exception("Suggestion generation failed")
+            with self._lock:
+                self.last_error = e
+                if not self.is_stale(generation):
+                    self._completed_generation = generation
+
+    def _generate(self, generation):
+        messages = list(self.conversation_state.messages)
+        context = self.conversation_state.get_context()
+        for cat in self.categories:
+            if self.is_stale(generation):
+                return
+            trigger_value = self.triggers[cat](messages, self.sia)
+            if trigger_value is None or trigger_value == self._trigger_state.get(cat):
+                continue
+            suggestion = self.engine.generate_suggestion(
+                context, cat, should_stop=lambda: self.is_stale(generation)
+            )
+            with self._lock:
+                if self.is_stale(generation):
+                    return  # result may be partial; the newer run will regenerate it
+                self._suggestions[cat] = suggestion
+                self._trigger_state[cat] = trigger_value
+        with self._lock:
+            if not self.is_stale(generation):
+                self._completed_generation = generation
+                self.last_error = None
\ No newline at end of file
@@ -0,0 +1,183 @@
+"""
+Materialized rollups of annotations and agent performance for the ROI dashboard.
+Rollups are kept as running sums and counts, tagged with the version of the
+source files they were built from. They are only rebuilt when a source file
+changes, and new annotations can be folded in without rereading the sources.
+"""
+
+import json
+import os
+import tempfile
+
+ANNOTATIONS_PATH = "data/annotations/annotations.json"
+PERFORMANCE_PATH = "data/performance/agent_performance.json"
+AGGREGATES_PATH = "data/aggregates/rollups.json"
+
+ROLLUP_SCHEMA_VERSION = 3
+UNKNOWN = "unknown"
+
+def empty_rollups():
+    return {
+        "schema_version": ROLLUP_SCHEMA_VERSION,
+        "source_version": None,
+        "annotations": {
+            "overall": {"sum": 0.0, "count": 0},
+            "by_agent": {},
+            "by_day": {},
+            "by_category": {}
+        },
+        "performance": {
+            "first": None,
+            "last": None,
+            "by_agent": {},
+            "by_day": {}
+        }
+    }
+
+def source_version(paths=(ANNOTATIONS_PATH, PERFORMANCE_PATH)):
+    """
+    Cheap version key for the source files, based on their size and mtime.
+    Changes whenever a source file is appended to or rewritten.
+    """
+    version = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            version.append((path, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            version.append((path, None, None))
+    return tuple(version)
+
+def _stored_version(version):
+    # Stored as lists so fresh and reloaded rollups compare equal after a JSON round-trip
+    return [list(entry) for entry in version]
+
+def _version_matches(rollups, version):
+    return rollups["source_version"] == _stored_version(version)
+
+def _add(bucket, key, value):
+    entry = bucket.setdefault(key, {"sum": 0.0, "count": 0})
+    entry["sum"] += value
+    entry["count"] += 1
+
+def _day(row):
+    value = row.get("date") or row.get("timestamp")
+    if not value:
+        return UNKNOWN
+    return str(value)[:10]  # ISO dates and datetimes share the YYYY-MM-DD prefix
+
+def apply_annotations(rollups, annotations):
+    """
+    Fold new annotation rows into the rollups.
+    """
+    agg = rollups["annotations"]
+    for ann in annotations:
+        rating = float(ann["rating"])
+        agg["overall"]["sum"] += rating
+        agg["overall"]["count"] += 1
+        _add(agg["by_agent"], ann.get("agent_id", UNKNOWN), rating)
+        _add(agg["by_day"], _day(ann), rating)
+        _add(agg["by_category"], ann.get("category", UNKNOWN), rating)
+    return rollups
+
+def apply_performance(rollups, performance):
+    """
+    Fold new performance rows into the rollups.
+    """
+    agg = rollups["performance"]
+    for row in performance:
+        score = float(row["performance_score"])
+        point = {"date": row.get("date"), "performance_score": score}
+        if agg["first"] is None:
+            agg["first"] = point
+        agg["last"] = point
+        agent = row.get("agent_id", UNKNOWN)
+        _add(agg["by_day"], _day(row), score)
+        entry = agg["by_agent"].setdefault(
+            agent, {"sum": 0.0, "count": 0, "first": score, "last": score}
+        )
+        entry["sum"] += score
+        entry["count"] += 1
+        entry["last"] = score
+    return rollups
+
+def _load_json_list(path):
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return []
+
+def load_rollups(path=AGGREGATES_PATH):
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            rollups = json.load(f)
+        if rollups.get("schema_version") == ROLLUP_SCHEMA_VERSION:
+            return rollups
+    return empty_rollups()
+
+def save_rollups(rollups, path=AGGREGATES_PATH):
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    # Each writer gets its own temp file so concurrent saves cannot collide
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(rollups, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def update_rollups(annotations_path=ANNOTATIONS_PATH,
+                   performance_path=PERFORMANCE_PATH,
+                   aggregates_path=AGGREGATES_PATH):
+    """
+    Return rollups matching the current source files.
+
+    Stored rollups are returned as-is while the sources are unchanged;
+    otherwise they are rebuilt in a single pass over the sources and saved.
+    """
+    version = source_version((annotations_path, performance_path))
+    rollups = load_rollups(aggregates_path)
+    if _version_matches(rollups, version):
+        return rollups
+    rollups = empty_rollups()
+    apply_annotations(rollups, _load_json_list(annotations_path))
+    apply_performance(rollups, _load_json_list(performance_path))
+    rollups["source_version"] = _stored_version(version)
+    save_rollups(rollups, aggregates_path)
+    return rollups
+
+def fold_new_annotation(annotation, previous_version,
+                        annotations_path=ANNOTATIONS_PATH,
+                        performance_path=PERFORMANCE_PATH,
+                        aggregates_path=AGGREGATES_PATH):
+    """
+    Fold a single just-saved annotation into the stored rollups.
+
+    `previous_version` is the source version from before the annotation was
+    written. If the stored rollups were not built from exactly that version,
+    nothing is done and the next update_rollups() call rebuilds them.
+    Returns True if the annotation was folded in.
+    """
+    rollups = load_rollups(aggregates_path)
+    if not _version_matches(rollups, previous_version):
+        return False
+    apply_annotations(rollups, [annotation])
+    rollups["source_version"] = _stored_version(source_version((annotations_path, performance_path)))
+    save_rollups(rollups, aggregates_path)
+    return True
+
+def mean(entry):
+    return entry["sum"] / entry["count"] if entry and entry["count"] else 0
+
+def performance_improvement(rollups):
+    """
+    Relative change between the first and last recorded performance scores.
+    """
+    first = rollups["performance"]["first"]
+    last = rollups["performance"]["last"]
+    if not first or not last or not first["performance_score"]:
+        return 0
+    return (last["performance_score"] - first["performance_score"]) / first["performance_score"]
\ No newline at end of file
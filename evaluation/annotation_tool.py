@@ -5,6 +5,9 @@ Streamlit app for QA team to annotate and rate AI coaching suggestions.
 import streamlit as st
 import json
 import os
+from datetime import datetime
+
+from evaluation.aggregates import PERFORMANCE_PATH, fold_new_annotation, source_version
 
 DATA_PATH = "data/annotations/annotations.json"
 
@@ -15,16 +18,20 @@ def load_annotations():
     return []
 
 def save_annotation(annotation):
+    previous_version = source_version((DATA_PATH, PERFORMANCE_PATH))
     annotations = load_annotations()
     annotations.append(annotation)
     os.makedirs(os.path.dirname(DATA_PATH), exist_ok=True)
     with open(DATA_PATH, "w", encoding="utf-8") as f:
         json.dump(annotations, f, indent=2)
+    # Fold the new annotation into the dashboard rollups without rereading the sources
+    fold_new_annotation(annotation, previous_version, annotations_path=DATA_PATH)
 
 def main():
     st.title("AI Coaching Suggestions Annotation Tool")
 
     conversation_id = st.text_input("Conversation ID")
+    agent_id = st.text_input("Agent ID (optional)")
     suggestion_category = st.selectbox(
         "Suggestion Category",
         ["tone_adjustment", "empathy", "technical_accuracy", "policy_reminder"]
@@ -39,10 +46,12 @@ def main():
         else:
             annotation = {
                 "conversation_id": conversation_id,
+                "agent_id": agent_id or "unknown",
                 "category": suggestion_category,
                 "suggestion": suggestion_text,
                 "rating": rating,
-                "comments": comments
+                "comments": comments,
+                "timestamp": datetime.now().isoformat()
             }
             save_annotation(annotation)
             st.success("Annotation saved!")
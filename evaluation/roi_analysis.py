@@ -2,33 +2,16 @@
 ROI analysis and agent performance improvement statistics.
 """
 
-import json
-import os
-import numpy as np
 import pandas as pd
 import plotly.express as px
 import streamlit as st
 
-ANNOTATIONS_PATH = "data/annotations/annotations.json"
-PERFORMANCE_PATH = "data/performance/agent_performance.json"
-
-def load_annotations():
-    if os.path.exists(ANNOTATIONS_PATH):
-        with open(ANNOTATIONS_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return []
-
-def load_performance():
-    if os.path.exists(PERFORMANCE_PATH):
-        with open(PERFORMANCE_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return []
-
-def calculate_average_rating(annotations):
-    if not annotations:
-        return 0
-    ratings = [ann['rating'] for ann in annotations]
-    return np.mean(ratings)
+from evaluation.aggregates import (
+    mean,
+    performance_improvement,
+    source_version,
+    update_rollups,
+)
 
 def calculate_roi(improvement_percent, cost, revenue_per_agent=100000):
     """
@@ -41,23 +24,46 @@ def calculate_roi(improvement_percent, cost, revenue_per_agent=100000):
     roi = (gain - cost) / cost if cost > 0 else 0
     return roi
 
+@st.cache_data(show_spinner=False, max_entries=1)
+def load_dashboard_rollups(version):
+    """
+    Cached rollup loader. `version` is the source file version key, so the
+    cache is only invalidated when annotations or performance data change.
+    """
+    return update_rollups()
+
+def rollup_frame(bucket, key_name):
+    rows = [
+        {key_name: key, "average": mean(entry), "count": entry["count"]}
+        for key, entry in bucket.items()
+    ]
+    return pd.DataFrame(rows, columns=[key_name, "average", "count"]).sort_values(key_name)
+
 def main():
     st.title("Agent Performance and ROI Analysis")
 
-    annotations = load_annotations()
-    performance = load_performance()
+    rollups = load_dashboard_rollups(source_version())
 
-    avg_rating = calculate_average_rating(annotations)
+    avg_rating = mean(rollups["annotations"]["overall"])
     st.metric("Average Suggestion Quality Rating", f"{avg_rating:.2f} / 5")
 
-    if performance:
-        df = pd.DataFrame(performance)
+    by_category = rollups["annotations"]["by_category"]
+    if by_category:
+        st.subheader("Suggestion Quality by Category")
+        st.dataframe(rollup_frame(by_category, "category"))
+
+    performance = rollups["performance"]
+    if performance["by_day"]:
+        df = rollup_frame(performance["by_day"], "date")
         st.subheader("Agent Performance Over Time")
-        fig = px.line(df, x="date", y="performance_score", title="Agent Performance Score Over Time")
+        fig = px.line(df, x="date", y="average", title="Average Agent Performance Score Per Day")
         st.plotly_chart(fig)
 
+        st.subheader("Performance by Agent")
+        st.dataframe(rollup_frame(performance["by_agent"], "agent_id"))
+
         # Calculate improvement percentage (example: last vs first)
-        improvement = (df['performance_score'].iloc[-1] - df['performance_score'].iloc[0]) / df['performance_score'].iloc[0]
+        improvement = performance_improvement(rollups)
         st.metric("Performance Improvement", f"{improvement*100:.2f}%")
 
         # ROI calculation input
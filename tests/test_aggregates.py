@@ -0,0 +1,117 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from evaluation.aggregates import (
+    fold_new_annotation,
+    load_rollups,
+    mean,
+    performance_improvement,
+    save_rollups,
+    source_version,
+    update_rollups,
+)
+
+class TestAggregates(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.annotations_path = os.path.join(self.tmp.name, "annotations.json")
+        self.performance_path = os.path.join(self.tmp.name, "performance.json")
+        self.aggregates_path = os.path.join(self.tmp.name, "rollups.json")
+        self.mtime = 1000
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, path, rows):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(rows, f)
+        # Explicit, increasing mtimes so coarse filesystem timestamps cannot hide a rewrite
+        self.mtime += 1
+        os.utime(path, (self.mtime, self.mtime))
+
+    def _update(self):
+        return update_rollups(self.annotations_path, self.performance_path, self.aggregates_path)
+
+    def _version(self):
+        return source_version((self.annotations_path, self.performance_path))
+
+    def test_rollups_and_reuse(self):
+        self._write(self.annotations_path, [
+            {"category": "empathy", "rating": 4, "agent_id": "a1", "timestamp": "2024-01-01T10:00:00"},
+            {"category": "tone_adjustment", "rating": 2, "agent_id": "a2", "timestamp": "2024-01-02T10:00:00"},
+            {"category": "empathy", "rating": 5, "agent_id": "a1"}
+        ])
+        self._write(self.performance_path, [
+            {"agent_id": "a1", "date": "2024-01-01", "performance_score": 50},
+            {"agent_id": "a2", "date": "2024-01-01", "performance_score": 70},
+            {"agent_id": "a1", "date": "2024-01-02", "performance_score": 60}
+        ])
+        rollups = self._update()
+        self.assertAlmostEqual(mean(rollups["annotations"]["overall"]), 11 / 3)
+        self.assertEqual(mean(rollups["annotations"]["by_category"]["empathy"]), 4.5)
+        self.assertEqual(rollups["annotations"]["by_day"]["unknown"]["count"], 1)
+        self.assertEqual(mean(rollups["performance"]["by_day"]["2024-01-01"]), 60.0)
+        self.assertEqual(rollups["performance"]["by_agent"]["a1"]["last"], 60.0)
+        self.assertAlmostEqual(performance_improvement(rollups), 0.2)
+
+        # Unchanged sources are not read again
+        with mock.patch("evaluation.aggregates._load_json_list") as load:
+            self.assertEqual(self._update(), rollups)
+            load.assert_not_called()
+
+    def test_rebuild_when_row_rewritten_in_place(self):
+        rows = [
+            {"agent_id": "a1", "date": "2024-01-01", "performance_score": 50},
+            {"agent_id": "a1", "date": "2024-01-02", "performance_score": 80}
+        ]
+        self._write(self.performance_path, rows)
+        self._update()
+        rows[1]["performance_score"] = 60  # same size, edited value
+        self._write(self.performance_path, rows)
+        rollups = self._update()
+        self.assertEqual(rollups["performance"]["by_agent"]["a1"]["sum"], 110.0)
+        self.assertAlmostEqual(performance_improvement(rollups), 0.2)
+
+        self._write(self.performance_path, rows[:1])
+        rollups = self._update()
+        self.assertEqual(rollups["performance"]["by_agent"]["a1"]["count"], 1)
+        self.assertEqual(performance_improvement(rollups), 0)
+
+    def test_fold_new_annotation(self):
+        annotations = [{"category": "empathy", "rating": 2}]
+        self._write(self.annotations_path, annotations)
+        self._update()
+
+        previous = self._version()
+        annotations.append({"category": "empathy", "rating": 4})
+        self._write(self.annotations_path, annotations)
+        folded = fold_new_annotation(
+            annotations[-1], previous,
+            self.annotations_path, self.performance_path, self.aggregates_path
+        )
+        self.assertTrue(folded)
+        with mock.patch("evaluation.aggregates._load_json_list") as load:
+            rollups = self._update()
+            load.assert_not_called()
+        self.assertEqual(rollups["annotations"]["overall"], {"sum": 6.0, "count": 2})
+
+        # Rollups built from a different version are left for a full rebuild
+        self.assertFalse(fold_new_annotation(
+            {"category": "empathy", "rating": 5}, previous,
+            self.annotations_path, self.performance_path, self.aggregates_path
+        ))
+
+    def test_save_to_bare_filename(self):
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        try:
+            save_rollups({"schema_version": -1}, "r.json")
+            self.assertEqual(load_rollups("r.json")["source_version"], None)
+            self.assertEqual(os.listdir("."), ["r.json"])
+        finally:
+            os.chdir(cwd)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
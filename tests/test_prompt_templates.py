@@ -0,0 +1,129 @@
+import json
+import os
+import tempfile
+import unittest
+from config import PROMPTS_DIR
+from engine.prompt_templates import PromptTemplateStore
+
+class WordTokenizer:
+    """Minimal tokenizer: one ID per whitespace-separated word."""
+    eos_token_id = 1
+
+    def __init__(self):
+        self.vocab = {}
+        self.calls = []
+
+    def encode(self, text, add_special_tokens=True):
+        self.calls.append(text)
+        return [self.vocab.setdefault(word, len(self.vocab) + 2) for word in text.split()]
+
+class TestPromptTemplates(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = PromptTemplateStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, version, header, mtime=None):
+        path = os.path.join(self.tmp.name, f"suggestion_v{version}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "name": "suggestion",
+                "version": version,
+                "header": header,
+                "instruction_prefix": " Based on the above, ",
+                "footer": " Be concise.",
+                "categories": {"empathy": "show empathy."}
+            }, f)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def test_latest_version_and_render(self):
+        self._write(1, "Old header:")
+        self._write(2, "New header:")
+        self.assertEqual(self.store.versions("suggestion"), [1, 2])
+        template = self.store.get("suggestion")
+        self.assertEqual(template.version, 2)
+        self.assertEqual(
+            template.render(" Customer: hi", "empathy"),
+            "New header: Customer: hi Based on the above, show empathy. Be concise."
+        )
+        self.assertEqual(self.store.get("suggestion", 1).header, "Old header:")
+
+    def test_cached_segments_and_left_truncation(self):
+        self._write(1, "Header:")
+        tokenizer = WordTokenizer()
+        template = self.store.get("suggestion")
+        ids = template.build_input_ids(tokenizer, "a b c d e f", "empathy", max_length=12)
+        self.assertEqual(len(ids), 12)
+        self.assertEqual(ids[-1], tokenizer.eos_token_id)
+        # Header (1) + last 2 conversation words + tail (8) + eos (1)
+        self.assertEqual(ids[1:3], [tokenizer.vocab["e"], tokenizer.vocab["f"]])
+        calls = len(tokenizer.calls)
+        template.build_input_ids(tokenizer, "g", "empathy")
+        self.assertEqual(len(tokenizer.calls), calls + 1)  # only the conversation is tokenized
+
+    def test_hot_reload(self):
+        self._write(1, "First:", mtime=1000)
+        self.assertEqual(self.store.get("suggestion").header, "First:")
+        self._write(1, "Second:", mtime=2000)
+        self.assertEqual(self.store.get("suggestion").header, "Second:")
+        with self.assertRaises(KeyError):
+            self.store.get("missing")
+
+    def test_invalid_edit_keeps_last_good_version(self):
+        self._write(1, "Good:", mtime=1000)
+        self.assertEqual(self.store.get("suggestion").header, "Good:")
+        path = os.path.join(self.tmp.name, "suggestion_v1.json")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"name": "suggestion", "hea')  # partially written file
+        os.utime(path, (2000, 2000))
+        with self.assertLogs("engine.prompt_templates", level="WARNING"):
+            self.assertEqual(self.store.get("suggestion").header, "Good:")
+        self._write(1, "Fixed:", mtime=3000)
+        self.assertEqual(self.store.get("suggestion").header, "Fixed:")
+
+    def test_ignores_files_outside_naming_scheme(self):
+        self._write(1, "Header:")
+        with open(os.path.join(self.tmp.name, "notes.json"), "w", encoding="utf-8") as f:
+            json.dump({"unrelated": True}, f)
+        self.assertEqual(self.store.versions("suggestion"), [1])
+
+    def test_filename_sets_version_and_mismatch_is_rejected(self):
+        self._write(1, "Original:")
+        with open(os.path.join(self.tmp.name, "suggestion_v1.json"), encoding="utf-8") as f:
+            copied = f.read()
+        # Copied to start a variant without bumping "version" in the body
+        with open(os.path.join(self.tmp.name, "suggestion_v2.json"), "w", encoding="utf-8") as f:
+            f.write(copied)
+        with self.assertLogs("engine.prompt_templates", level="WARNING"):
+            self.assertEqual(self.store.versions("suggestion"), [1])
+
+    def test_fixed_segments_over_budget(self):
+        self._write(1, "Header:")
+        tokenizer = WordTokenizer()
+        template = self.store.get("suggestion")
+        with self.assertRaises(ValueError):
+            template.build_input_ids(tokenizer, "a b c", "empathy", max_length=10)
+
+        # A store that knows the tokenizer rejects an oversized edit at load time
+        store = PromptTemplateStore(self.tmp.name, tokenizer=tokenizer, max_length=12)
+        self.assertEqual(store.get("suggestion").header, "Header:")
+        self._write(1, "A much longer header:", mtime=5000)
+        with self.assertLogs("engine.prompt_templates", level="WARNING"):
+            self.assertEqual(store.get("suggestion").header, "Header:")
+
+    def test_shipped_template_matches_original_prompt(self):
+        template = PromptTemplateStore(PROMPTS_DIR).get("suggestion", 1)
+        self.assertEqual(
+            template.render("Customer: my order is late", "empathy"),
+            "You are an AI assistant helping a customer support agent improve their chat responses.\n"
+            "Here is the recent conversation:\n"
+            "Customer: my order is late\n\n"
+            "Based on the above, Suggest ways the agent can show more empathy and understanding towards the customer.\n"
+            "Provide a concise suggestion."
+        )
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
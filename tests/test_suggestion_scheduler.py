@@ -0,0 +1,97 @@
+import threading
+import time
+import unittest
+from engine.suggestion_engine import ConversationState
+from engine.suggestion_scheduler import SuggestionScheduler
+
+class KeywordSentiment:
+    """Stand-in for VADER: 'angry' is negative, everything else neutral."""
+    def polarity_scores(self, text):
+        return {"compound": -0.6 if "angry" in text.lower() else 0.0}
+
+class RecordingEngine:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.cancelled = 0
+
+    def generate_suggestion(self, conversation_context, category, should_stop=None):
+        self.calls.append(category)
+        deadline = time.time() + self.delay
+        while time.time() < deadline:
+            if should_stop and should_stop():
+                self.cancelled += 1
+                return ""
+            time.sleep(0.005)
+        return f"{category} suggestion"
+
+class FailingEngine:
+    def generate_suggestion(self, conversation_context, category, should_stop=None):
+        raise RuntimeError("model unavailable")
+
+class TestSuggestionScheduler(unittest.TestCase):
+    def _scheduler(self, engine, debounce_ms=50):
+        state = ConversationState("test")
+        scheduler = SuggestionScheduler(
+            engine, state, debounce_ms=debounce_ms, sentiment_analyzer=KeywordSentiment()
+        )
+        self.addCleanup(scheduler.shutdown)
+        return state, scheduler
+
+    def _wait(self, scheduler, timeout=5.0):
+        deadline = time.time() + timeout
+        while scheduler.is_pending() and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(scheduler.is_pending())
+
+    def test_debounce_and_selective_regeneration(self):
+        engine = RecordingEngine()
+        state, scheduler = self._scheduler(engine)
+        state.add_message("customer", "I am angry, my refund never arrived.")
+        state.add_message("agent", "Hello there, let me check on that for you.")
+        self._wait(scheduler)
+        # One debounced run; technical_accuracy has no trigger yet
+        self.assertEqual(sorted(engine.calls), ["empathy", "policy_reminder", "tone_adjustment"])
+
+        engine.calls.clear()
+        state.add_message("agent", "Please restart your router.")
+        self._wait(scheduler)
+        self.assertEqual(sorted(engine.calls), ["technical_accuracy", "tone_adjustment"])
+        self.assertEqual(len(scheduler.get_suggestions()), 4)
+
+    def test_stale_generation_is_cancelled(self):
+        engine = RecordingEngine(delay=1.0)
+        state, scheduler = self._scheduler(engine, debounce_ms=10)
+        state.add_message("agent", "Hello, how can I help you today?")
+        time.sleep(0.2)  # let the first generation start
+        state.add_message("agent", "Sorry, how can I help you today?")
+        engine.delay = 0.0
+        self._wait(scheduler)
+        self.assertEqual(engine.cancelled, 1)
+        self.assertEqual(scheduler.get_suggestions(), [("tone_adjustment", "tone_adjustment suggestion")])
+
+    def test_failed_generation_is_reported_and_not_pending(self):
+        engine = RecordingEngine()
+        state, scheduler = self._scheduler(engine)
+        state.add_message("agent", "Hello, how can I help you today?")
+        self._wait(scheduler)
+        previous = scheduler.get_suggestions()
+
+        scheduler.engine = FailingEngine()
+        with self.assertLogs("engine.suggestion_scheduler", level="ERROR"):
+            state.add_message("agent", "Could you tell me your order number?")
+            self._wait(scheduler)
+        self.assertIsInstance(scheduler.last_error, RuntimeError)
+        self.assertEqual(scheduler.get_suggestions(), previous)
+
+    def test_shutdown_leaves_shared_workers_running(self):
+        engine = RecordingEngine()
+        closed_state, closed = self._scheduler(engine)
+        state, scheduler = self._scheduler(engine)
+        closed.shutdown()  # e.g. a session that went away
+        state.add_message("agent", "Hello, how can I help you today?")
+        self._wait(scheduler)
+        self.assertEqual(engine.calls, ["tone_adjustment"])
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
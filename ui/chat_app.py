@@ -2,8 +2,11 @@
 Streamlit app for interactive customer support chat simulation with AI coaching suggestions.
 """
 
+import time
 import streamlit as st
+from config import SUGGESTION_POLL_MS
 from engine.suggestion_engine import ConversationState, SuggestionEngine
+from engine.suggestion_scheduler import SuggestionScheduler
 
 st.set_page_config(page_title="Customer Support Chat Tutor", layout="wide")
 
@@ -14,8 +17,11 @@ if "conv_state" not in st.session_state:
 if "engine" not in st.session_state:
     st.session_state.engine = SuggestionEngine()
 
-if "suggestions" not in st.session_state:
-    st.session_state.suggestions = []
+if "scheduler" not in st.session_state:
+    # Generates suggestions in the background as messages arrive
+    st.session_state.scheduler = SuggestionScheduler(
+        st.session_state.engine, st.session_state.conv_state
+    )
 
 if "feedback" not in st.session_state:
     st.session_state.feedback = []
@@ -24,14 +30,7 @@ def add_message(sender, text):
     st.session_state.conv_state.add_message(sender, text)
 
 def get_suggestions():
-    categories = ["tone_adjustment", "empathy", "technical_accuracy", "policy_reminder"]
-    suggestions = []
-    for cat in categories:
-        suggestion = st.session_state.engine.generate_suggestion(
-            st.session_state.conv_state.get_context(), cat
-        )
-        suggestions.append((cat, suggestion))
-    return suggestions
+    return st.session_state.scheduler.get_suggestions()
 
 def main():
     st.title("LLM-powered Customer Support Chat Tutor")
@@ -54,13 +53,17 @@ def main():
             # For demo, simulate a customer reply
             add_message("customer", "Thank you for your help!")
 
-            # Generate AI coaching suggestions
-            st.session_state.suggestions = get_suggestions()
-
     # Show AI coaching suggestions
-    if st.session_state.suggestions:
+    suggestions = get_suggestions()
+    if st.session_state.scheduler.last_error is not None:
+        st.warning(f"Could not update coaching suggestions: {st.session_state.scheduler.last_error}")
+    pending = st.session_state.scheduler.is_pending()
+    if pending:
+        st.caption("Updating coaching suggestions...")
+        st.button("Refresh suggestions")  # fallback if automatic polling is interrupted
+    if suggestions:
         st.subheader("AI Coaching Suggestions")
-        for cat, suggestion in st.session_state.suggestions:
+        for cat, suggestion in suggestions:
             st.markdown(f"**{cat.replace('_', ' ').title()}:** {suggestion}")
             col1, col2 = st.columns(2)
             with col1:
@@ -81,5 +84,10 @@ def main():
         for cat, counts in feedback_counts.items():
             st.markdown(f"**{cat.replace('_', ' ').title()}**: 👍 {counts['like']} | 👎 {counts['dislike']}")
 
+    # Background workers fill in suggestions; rerun until they are done
+    if pending:
+        time.sleep(SUGGESTION_POLL_MS / 1000)
+        st.rerun()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file